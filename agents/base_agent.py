@@ -1,36 +1,105 @@
 """Base agent class with tool support."""
 import json
 import asyncio
+import time
+from collections import deque
 from abc import ABC, abstractmethod
-from typing import Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Any, ClassVar, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to a JSON string (two-space indented if requested), using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def json_dumpb(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, skipping orjson's bytes -> str round trip."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def write_json(path: str, obj: Any, indent: bool = False) -> int:
+    """Write obj as JSON in one buffered write; returns bytes written."""
+    data = json_dumpb(obj, indent)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def _format_timestamp_ns(timestamp_ns: int) -> str:
+    """Format a time.time_ns() value as a local ISO 8601 string."""
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000).isoformat()
+
+
+@dataclass(slots=True)
 class Message:
-    """Message structure for inter-agent communication."""
+    """
+    Message structure for inter-agent communication.
+    
+    Creation time is stored as timestamp_ns (from time.time_ns()); pass
+    timestamp_ns to set it. timestamp is a read-only ISO 8601 view of it.
+    """
     sender: str
     content: str
     tool_calls: Optional[list] = None
-    timestamp: str = None
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    data: Optional[dict] = None  # Structured form of content for in-process consumers
+    
+    @property
+    def timestamp(self) -> str:
+        """Creation time as an ISO 8601 string, formatted on access."""
+        return _format_timestamp_ns(self.timestamp_ns)
     
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now().isoformat()
+    def to_dict(self) -> dict:
+        """
+        Convert message to a plain dict without deep-copying fields.
+        
+        The raw timestamp_ns is kept; the ISO string is only formatted
+        when a report or get_history() needs it.
+        """
+        return {
+            "sender": self.sender,
+            "content": self.content,
+            "tool_calls": self.tool_calls,
+            "timestamp_ns": self.timestamp_ns
+        }
 
 
 class BaseAgent(ABC):
     """Base agent with tool capability."""
     
-    def __init__(self, name: str, role: str, tools: Optional[dict] = None):
+    # Tools shared by every instance of the agent class
+    TOOLS: ClassVar[dict] = {}
+    
+    def __init__(
+        self,
+        name: str,
+        role: str,
+        tools: Optional[dict] = None,
+        history_limit: Optional[int] = None
+    ):
         self.name = name
         self.role = role
-        self.tools = tools or {}
-        self.conversation_history = []
+        self.tools = tools if tools is not None else self.TOOLS
+        # Long-lived agents keep only their latest history_limit messages
+        self.conversation_history = deque(maxlen=history_limit) if history_limit else []
     
     def register_tool(self, tool_name: str, tool_func):
-        """Register a tool that this agent can use."""
+        """Register a tool that this agent instance can use."""
+        if self.tools is self.TOOLS:
+            # Copy on first write so the class-level tools stay shared
+            self.tools = dict(self.tools)
         self.tools[tool_name] = tool_func
     
     async def execute_tool(self, tool_name: str, **kwargs) -> Any:
@@ -47,9 +116,20 @@ class BaseAgent(ABC):
         except Exception as e:
             return {"error": str(e)}
     
+    @staticmethod
+    def get_full_text(reader_output: dict) -> str:
+        """Get the paper text joined from Reader sections."""
+        return " ".join(str(v) for v in reader_output.get("sections", {}).values())
+    
+    @staticmethod
+    def get_text_length(reader_output: dict) -> int:
+        """Get the length of the joined paper text without building it."""
+        sections = reader_output.get("sections", {})
+        return sum(len(str(v)) for v in sections.values()) + max(0, len(sections) - 1)
+    
     def add_to_history(self, message: Message):
         """Add message to conversation history."""
-        self.conversation_history.append(asdict(message))
+        self.conversation_history.append(message.to_dict())
     
     @abstractmethod
     async def process(self, input_data: str) -> Message:
@@ -57,5 +137,22 @@ class BaseAgent(ABC):
         pass
     
     def get_history(self) -> list:
-        """Get conversation history."""
-        return self.conversation_history
+        """
+        Get conversation history.
+        
+        Each entry has the message's sender, content, tool_calls and ISO 8601
+        timestamp; timestamps are formatted here instead of on every append.
+        """
+        return [
+            {
+                "sender": entry["sender"],
+                "content": entry["content"],
+                "tool_calls": entry["tool_calls"],
+                "timestamp": _format_timestamp_ns(entry["timestamp_ns"])
+            }
+            for entry in self.conversation_history
+        ]
+    
+    def clear_history(self):
+        """Forget the conversation history, e.g. before reusing the agent."""
+        self.conversation_history.clear()
@@ -0,0 +1,105 @@
+"""Batch scheduler for high-volume paper review queues."""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from agents.orchestrator import PaperReviewOrchestrator
+
+
+class ReviewBatchScheduler:
+    """
+    Groups queued paper reviews into batches and runs each batch concurrently.
+    
+    A batch is dispatched once it reaches batch_size papers or once
+    max_wait seconds have passed since its first paper was queued. Papers
+    submitted while a batch is running accumulate into the next one.
+    """
+    
+    def __init__(self, batch_size: int = 8, max_wait: float = 0.05):
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._dispatcher: Optional[asyncio.Task] = None
+        # Papers taken off the queue for the batch being collected or reviewed
+        self._batch: List[Tuple[str, asyncio.Future]] = []
+    
+    def start(self):
+        """Start the dispatcher if it is not already running."""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+    
+    async def stop(self):
+        """
+        Stop the dispatcher.
+        
+        Papers still queued or under review are not reviewed; their submit()
+        calls raise asyncio.CancelledError.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        
+        for _, future in self._batch:
+            future.cancel()
+        self._batch = []
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+    
+    async def submit(self, paper_path: str) -> Dict[str, Any]:
+        """
+        Queue a paper and wait for its review.
+        
+        Args:
+            paper_path: Path to paper PDF or paper identifier
+        
+        Returns:
+            Complete review from PaperReviewOrchestrator.review_paper
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((paper_path, future))
+        return await future
+    
+    async def _next_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """
+        Wait for the first paper, then collect more until full or timed out.
+        
+        Papers are collected into self._batch so stop() can cancel them
+        while the batch is still being filled.
+        """
+        self._batch = batch = [await self._queue.get()]
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _dispatch_loop(self):
+        """Dispatch batches until stopped."""
+        while True:
+            batch = await self._next_batch()
+            # If stopped mid-batch, stop() cancels the futures in self._batch
+            reviews = await PaperReviewOrchestrator.review_papers(
+                [paper_path for paper_path, _ in batch],
+                max_concurrency=self.batch_size
+            )
+            self._batch = []
+            
+            for (_, future), review in zip(batch, reviews):
+                if future.done():
+                    continue
+                if isinstance(review, BaseException):
+                    future.set_exception(review)
+                else:
+                    future.set_result(review)
@@ -1,9 +1,15 @@
 """Critic Agent: Identifies weaknesses and provides detailed feedback."""
 import asyncio
-import json
-from agents.base_agent import BaseAgent, Message
+from collections import Counter
+from typing import Optional
+from agents.base_agent import BaseAgent, Message, json_dumps
 from agents.tools import analyze_text_quality, extract_citations
 
+# Issue severity levels
+_SEV_CRITICAL = "CRITICAL"
+_SEV_MAJOR = "MAJOR"
+_SEV_MINOR = "MINOR"
+
 
 class CriticAgent(BaseAgent):
     """
@@ -15,82 +21,152 @@ class CriticAgent(BaseAgent):
     - Uses: Text quality analysis tool, citation extraction tool
     """
     
-    def __init__(self):
+    TOOLS = {
+        "analyze_text_quality": analyze_text_quality,
+        "extract_citations": extract_citations
+    }
+    
+    def __init__(self, history_limit: Optional[int] = None):
         super().__init__(
             name="Critic",
-            role="Weakness & Issue Identifier"
+            role="Weakness & Issue Identifier",
+            history_limit=history_limit
         )
-        
-        # Register tools
-        self.register_tool("analyze_text_quality", analyze_text_quality)
-        self.register_tool("extract_citations", extract_citations)
     
-    async def process(self, reader_output: dict, meta_assessment: dict) -> Message:
+    async def process(
+        self,
+        reader_output: dict,
+        meta_assessment: dict,
+        *,
+        full_text: Optional[str] = None,
+        citations: Optional[dict] = None
+    ) -> Message:
         """
         Identify issues and weaknesses in the paper.
         
         Args:
             reader_output: Dictionary with extracted paper content from Reader
             meta_assessment: Assessment from MetaReviewer
+            full_text: Paper text joined from the Reader sections, if already built
+            citations: extract_citations result over full_text, if already computed
         
         Returns:
             Message with identified issues and recommendations
         """
+        analysis = await self._analyze(reader_output, full_text=full_text, citations=citations)
+        return await self._finalize(analysis, meta_assessment)
+    
+    async def _analyze(
+        self,
+        reader_output: dict,
+        *,
+        full_text: Optional[str] = None,
+        citations: Optional[dict] = None
+    ) -> dict:
+        """
+        Run the tool-driven part of the critique.
+        
+        Only depends on the Reader output, so the orchestrator can run it
+        concurrently with the MetaReviewer.
+        
+        Args:
+            reader_output: Dictionary with extracted paper content from Reader
+            full_text: Paper text joined from the Reader sections, if already built
+            citations: extract_citations result over full_text, if already computed
+        
+        Returns:
+            Partial analysis to be completed by _finalize
+        """
         tool_calls = []
         
         # Reconstruct text from sections
-        sections = reader_output.get("sections", {})
-        full_text = " ".join(str(v) for v in sections.values())
+        sections = reader_output.get("sections") or {}
+        if full_text is None:
+            full_text = self.get_full_text(reader_output)
+        text_length = len(full_text)
         
         # Analyze text quality
         quality_result = await self.execute_tool("analyze_text_quality", text=full_text)
         tool_calls.append({
             "tool": "analyze_text_quality",
-            "input": {"text_length": len(full_text)},
+            "input": {"text_length": text_length},
             "output": f"Identified {len(quality_result.get('issues', []))} quality issues"
         })
         
-        # Analyze citations
-        citations_result = await self.execute_tool("extract_citations", text=full_text)
+        # Analyze citations (reuse the caller's result when available)
+        citations_result = citations
+        if citations_result is None:
+            citations_result = await self.execute_tool("extract_citations", text=full_text)
         tool_calls.append({
             "tool": "extract_citations",
-            "input": {"text_length": len(full_text)},
+            "input": {"text_length": text_length},
             "output": f"Analyzed {citations_result.get('citation_count', 0)} citations"
         })
         
-        # Generate detailed critique
-        critique = self._generate_critique(
+        issues = self._identify_issues(
             sections=sections,
             quality_result=quality_result,
-            citations_result=citations_result,
-            meta_assessment=meta_assessment,
-            reader_output=reader_output
+            citations_result=citations_result
         )
         
+        return {
+            "paper_id": reader_output.get("paper_id"),
+            "issues": issues,
+            "tool_calls": tool_calls
+        }
+    
+    async def _finalize(self, analysis: dict, meta_assessment: dict) -> Message:
+        """
+        Complete the critique once the MetaReviewer assessment is available.
+        
+        Args:
+            analysis: Partial analysis returned by _analyze
+            meta_assessment: Assessment from MetaReviewer
+        
+        Returns:
+            Message with identified issues and recommendations
+        """
+        issues = list(analysis["issues"])
+        
+        # Low quality score check
+        if meta_assessment.get("overall_quality") == "POOR":
+            issues.append({
+                "category": "OVERALL",
+                "issue": "Overall paper quality is poor",
+                "severity": _SEV_CRITICAL,
+                "recommendation": "Major revisions needed across all sections"
+            })
+        
+        # Count severities once for the critique and the response
+        severity_counts = Counter(i.get("severity") for i in issues)
+        
+        # Generate detailed critique
+        critique = self._generate_critique(issues, severity_counts)
+        
         response_content = {
             "status": "success",
-            "paper_id": reader_output.get("paper_id"),
+            "paper_id": analysis.get("paper_id"),
             "critique": critique,
             "severity_levels": {
-                "critical": len([i for i in critique.get("issues", []) if i.get("severity") == "CRITICAL"]),
-                "major": len([i for i in critique.get("issues", []) if i.get("severity") == "MAJOR"]),
-                "minor": len([i for i in critique.get("issues", []) if i.get("severity") == "MINOR"])
+                "critical": severity_counts[_SEV_CRITICAL],
+                "major": severity_counts[_SEV_MAJOR],
+                "minor": severity_counts[_SEV_MINOR]
             }
         }
         
         response = Message(
             sender=self.name,
-            content=json.dumps(response_content, indent=2),
-            tool_calls=tool_calls
+            content=json_dumps(response_content),
+            data=response_content,
+            tool_calls=analysis["tool_calls"]
         )
         
         self.add_to_history(response)
         return response
     
-    def _generate_critique(self, sections: dict, quality_result: dict, 
-                          citations_result: dict, meta_assessment: dict,
-                          reader_output: dict) -> dict:
-        """Generate detailed critique with identified issues."""
+    def _identify_issues(self, sections: dict, quality_result: dict,
+                         citations_result: dict) -> list:
+        """Identify issues that do not depend on the MetaReviewer assessment."""
         
         issues = []
         
@@ -99,23 +175,27 @@ class CriticAgent(BaseAgent):
             issues.append({
                 "category": "CLARITY",
                 "issue": issue,
-                "severity": "MAJOR"
+                "severity": _SEV_MAJOR
             })
         
+        methodology = sections.get("methodology")
+        conclusion = sections.get("conclusion")
+        abstract = sections.get("abstract") or ""
+        
         # Structural issues
-        if not sections.get("methodology"):
+        if not methodology:
             issues.append({
                 "category": "STRUCTURE",
                 "issue": "Methodology section is missing or unclear",
-                "severity": "CRITICAL",
+                "severity": _SEV_CRITICAL,
                 "recommendation": "Add detailed methodology description"
             })
         
-        if not sections.get("conclusion"):
+        if not conclusion:
             issues.append({
                 "category": "STRUCTURE",
                 "issue": "Conclusion section is missing",
-                "severity": "CRITICAL",
+                "severity": _SEV_CRITICAL,
                 "recommendation": "Add conclusion summarizing findings and future work"
             })
         
@@ -125,7 +205,7 @@ class CriticAgent(BaseAgent):
             issues.append({
                 "category": "REFERENCES",
                 "issue": f"Insufficient citations ({citation_count} found)",
-                "severity": "MAJOR",
+                "severity": _SEV_MAJOR,
                 "recommendation": "Add more relevant references to support claims"
             })
         
@@ -135,45 +215,40 @@ class CriticAgent(BaseAgent):
             issues.append({
                 "category": "READABILITY",
                 "issue": "Sentences are too long on average",
-                "severity": "MINOR",
+                "severity": _SEV_MINOR,
                 "recommendation": "Break longer sentences into shorter, clearer ones"
             })
         
         # Abstract check
-        abstract = sections.get("abstract", "")
         if len(abstract) < 50:
             issues.append({
                 "category": "CONTENT",
                 "issue": "Abstract is too brief",
-                "severity": "MAJOR",
+                "severity": _SEV_MAJOR,
                 "recommendation": "Expand abstract to properly summarize the paper"
             })
         
-        # Low quality score check
-        if meta_assessment.get("overall_quality") == "POOR":
-            issues.append({
-                "category": "OVERALL",
-                "issue": "Overall paper quality is poor",
-                "severity": "CRITICAL",
-                "recommendation": "Major revisions needed across all sections"
-            })
+        return issues
+    
+    def _generate_critique(self, issues: list, severity_counts: Counter) -> dict:
+        """Generate detailed critique from the identified issues."""
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(issues)
+        recommendations = self._generate_recommendations(severity_counts)
         
         return {
             "issue_count": len(issues),
             "issues": issues,
             "recommendations": recommendations,
-            "summary": self._generate_summary(issues)
+            "summary": self._generate_summary(len(issues), severity_counts)
         }
     
-    def _generate_recommendations(self, issues: list) -> list:
+    def _generate_recommendations(self, severity_counts: Counter) -> list:
         """Generate actionable recommendations."""
         recommendations = []
         
-        critical_count = len([i for i in issues if i.get("severity") == "CRITICAL"])
-        major_count = len([i for i in issues if i.get("severity") == "MAJOR"])
+        critical_count = severity_counts[_SEV_CRITICAL]
+        major_count = severity_counts[_SEV_MAJOR]
         
         if critical_count > 0:
             recommendations.append({
@@ -194,16 +269,16 @@ class CriticAgent(BaseAgent):
         
         return recommendations
     
-    def _generate_summary(self, issues: list) -> str:
+    def _generate_summary(self, issue_count: int, severity_counts: Counter) -> str:
         """Generate summary of critique."""
-        if not issues:
+        if not issue_count:
             return "No significant issues identified."
         
-        critical = len([i for i in issues if i.get("severity") == "CRITICAL"])
-        major = len([i for i in issues if i.get("severity") == "MAJOR"])
-        minor = len([i for i in issues if i.get("severity") == "MINOR"])
+        critical = severity_counts[_SEV_CRITICAL]
+        major = severity_counts[_SEV_MAJOR]
+        minor = severity_counts[_SEV_MINOR]
         
-        summary = f"Identified {len(issues)} total issues: "
+        summary = f"Identified {issue_count} total issues: "
         parts = []
         if critical > 0:
             parts.append(f"{critical} critical")
@@ -1,9 +1,12 @@
 """MetaReviewer Agent: Assesses research contribution and methodological quality."""
 import asyncio
-import json
-from agents.base_agent import BaseAgent, Message
+from typing import Optional
+from agents.base_agent import BaseAgent, Message, json_dumps
 from agents.tools import extract_citations, save_review_result
 
+# Substrings that signal a claimed contribution in the abstract
+_NOVEL_WORDS = frozenset({"novel", "new", "first", "propose", "introduce"})
+
 
 class MetaReviewerAgent(BaseAgent):
     """
@@ -15,37 +18,54 @@ class MetaReviewerAgent(BaseAgent):
     - Uses: Citation extraction tool, file I/O tool
     """
     
-    def __init__(self):
+    TOOLS = {
+        "extract_citations": extract_citations,
+        "save_review": save_review_result
+    }
+    
+    def __init__(self, history_limit: Optional[int] = None):
         super().__init__(
             name="MetaReviewer",
-            role="Quality & Contribution Assessor"
+            role="Quality & Contribution Assessor",
+            history_limit=history_limit
         )
-        
-        # Register tools
-        self.register_tool("extract_citations", extract_citations)
-        self.register_tool("save_review", save_review_result)
     
-    async def process(self, reader_output: dict) -> Message:
+    async def process(
+        self,
+        reader_output: dict,
+        *,
+        full_text: Optional[str] = None,
+        citations: Optional[dict] = None
+    ) -> Message:
         """
         Assess paper quality based on Reader output.
         
         Args:
             reader_output: Dictionary with extracted paper content from Reader
+            full_text: Paper text joined from the Reader sections, if already built
+            citations: extract_citations result over full_text, if already computed
         
         Returns:
             Message with quality assessment
         """
         tool_calls = []
         
-        # Extract full text for citation analysis
-        sections = reader_output.get("sections", {})
-        full_text = " ".join(str(v) for v in sections.values())
+        sections = reader_output.get("sections") or {}
+        paper_id = reader_output.get("paper_id")
         
-        # Analyze citations
-        citations_result = await self.execute_tool("extract_citations", text=full_text)
+        # Analyze citations (reuse the caller's result when available,
+        # in which case the full text is not needed here)
+        citations_result = citations
+        if citations_result is None:
+            if full_text is None:
+                full_text = self.get_full_text(reader_output)
+            citations_result = await self.execute_tool("extract_citations", text=full_text)
         tool_calls.append({
             "tool": "extract_citations",
-            "input": {"text_length": len(full_text)},
+            "input": {
+                "text_length": len(full_text) if full_text is not None
+                else self.get_text_length(reader_output)
+            },
             "output": f"Found {citations_result.get('citation_count', 0)} citations"
         })
         
@@ -57,20 +77,21 @@ class MetaReviewerAgent(BaseAgent):
         )
         
         # Save review
+        filename = f"{reader_output.get('paper_id', 'paper')}_assessment.json"
         save_result = await self.execute_tool(
             "save_review",
-            filename=f"{reader_output.get('paper_id', 'paper')}_assessment.json",
+            filename=filename,
             content=assessment
         )
         tool_calls.append({
             "tool": "save_review",
-            "input": {"filename": f"{reader_output.get('paper_id')}_assessment.json"},
+            "input": {"filename": filename},
             "output": f"Saved to {save_result.get('filepath', 'unknown')}"
         })
         
         response_content = {
             "status": "success",
-            "paper_id": reader_output.get("paper_id"),
+            "paper_id": paper_id,
             "assessment": assessment,
             "citations_found": citations_result.get("citation_count", 0),
             "novelty_score": assessment.get("novelty_score", 0),
@@ -80,7 +101,8 @@ class MetaReviewerAgent(BaseAgent):
         
         response = Message(
             sender=self.name,
-            content=json.dumps(response_content, indent=2),
+            content=json_dumps(response_content),
+            data=response_content,
             tool_calls=tool_calls
         )
         
@@ -92,8 +114,8 @@ class MetaReviewerAgent(BaseAgent):
         
         # Novelty assessment
         abstract = sections.get("abstract", "")
-        has_novel_language = any(word in abstract.lower() for word in 
-                                 ["novel", "new", "first", "propose", "introduce"])
+        abstract_lower = abstract.lower()
+        has_novel_language = any(word in abstract_lower for word in _NOVEL_WORDS)
         novelty_score = 7 if has_novel_language else 5
         
         # Methodology assessment
@@ -106,7 +128,7 @@ class MetaReviewerAgent(BaseAgent):
         citation_score = min(10, 3 + (citation_count // 5))  # More citations = better
         
         # Completeness assessment
-        sections_present = len([s for s in sections.values() if s])
+        sections_present = sum(1 for s in sections.values() if s)
         completeness_score = min(10, 2 + (sections_present * 1.5))
         
         # Overall quality
@@ -1,20 +1,25 @@
 """Multi-Agent Orchestrator using LangGraph."""
 import asyncio
-import json
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, AsyncIterator, List
+from agents.base_agent import BaseAgent
 from agents.reader_agent import ReaderAgent
 from agents.meta_reviewer_agent import MetaReviewerAgent
 from agents.critic_agent import CriticAgent
+from agents.tools import extract_citations
 
 
 class PaperReviewOrchestrator:
     """Orchestrates the multi-agent paper review workflow."""
     
-    def __init__(self):
-        self.reader = ReaderAgent()
-        self.meta_reviewer = MetaReviewerAgent()
-        self.critic = CriticAgent()
-        self.workflow_history = []
+    def __init__(self, history_limit: Optional[int] = None):
+        # history_limit bounds the histories to the latest that many reviews
+        # (None keeps everything), for orchestrators that outlive many reviews
+        self.reader = ReaderAgent(history_limit=history_limit)
+        self.meta_reviewer = MetaReviewerAgent(history_limit=history_limit)
+        self.critic = CriticAgent(history_limit=history_limit)
+        # Three workflow steps per review
+        self.workflow_history = deque(maxlen=3 * history_limit) if history_limit else []
     
     async def review_paper(self, paper_path: str) -> Dict[str, Any]:
         """
@@ -31,6 +36,25 @@ class PaperReviewOrchestrator:
         Returns:
             Complete review with feedback from all agents
         """
+        async for event in self.review_paper_streaming(paper_path):
+            review = event["data"]
+        return review  # The last event carries the complete review
+    
+    async def review_paper_streaming(self, paper_path: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute the review workflow, yielding each agent's result as it finishes.
+        
+        Events are {"stage": ..., "data": ...} dicts whose data holds the
+        matching keys of the final review, so consumers can merge them into
+        a partial review as they arrive:
+        - "reader": paper_id and reader_extraction
+        - "metareviewer": quality_assessment
+        - "critic": critique
+        - "complete": the full review, as returned by review_paper
+        
+        Args:
+            paper_path: Path to paper PDF or paper identifier
+        """
         print(f"\n{'='*70}")
         print(f"Starting Multi-Agent Paper Review for: {paper_path}")
         print(f"{'='*70}\n")
@@ -39,9 +63,9 @@ class PaperReviewOrchestrator:
         print("[1/3] Reader Agent: Extracting paper content...")
         reader_message = await self.reader.process(paper_path)
         
-        try:
-            reader_output = json.loads(reader_message.content)
-        except json.JSONDecodeError:
+        if reader_message.data is not None:
+            reader_output = reader_message.data
+        else:
             reader_output = {"sections": {}, "paper_id": paper_path}
         
         print(f"✓ Reader completed. Found {reader_output.get('text_length', 0)} characters.")
@@ -52,16 +76,29 @@ class PaperReviewOrchestrator:
             "agent": "Reader",
             "message": reader_message
         })
+        yield {
+            "stage": "reader",
+            "data": {
+                "paper_id": reader_output.get("paper_id"),
+                "reader_extraction": self._reader_extraction(reader_output)
+            }
+        }
+        
+        # Both MetaReviewer and Critic analyze citations over the same text,
+        # so join the text and extract them once and pass both along
+        full_text = BaseAgent.get_full_text(reader_output)
+        citations = extract_citations(text=full_text)
         
-        # Step 2: MetaReviewer Agent
+        # Steps 2 & 3: MetaReviewer and the Critic's tool analysis only depend
+        # on the Reader output, so run them concurrently
         print("\n[2/3] MetaReviewer Agent: Assessing quality and contribution...")
-        meta_message = await self.meta_reviewer.process(reader_output)
+        meta_message, critic_analysis = await asyncio.gather(
+            self.meta_reviewer.process(reader_output, full_text=full_text, citations=citations),
+            self.critic._analyze(reader_output, full_text=full_text, citations=citations)
+        )
         
-        try:
-            meta_output = json.loads(meta_message.content)
-            assessment = meta_output.get("assessment", {})
-        except json.JSONDecodeError:
-            assessment = {}
+        meta_output = meta_message.data or {}
+        assessment = meta_output.get("assessment", {})
         
         print(f"✓ MetaReviewer completed.")
         print(f"  Overall Quality: {assessment.get('overall_quality', 'UNKNOWN')}")
@@ -73,16 +110,14 @@ class PaperReviewOrchestrator:
             "agent": "MetaReviewer",
             "message": meta_message
         })
+        yield {"stage": "metareviewer", "data": {"quality_assessment": assessment}}
         
-        # Step 3: Critic Agent
+        # Step 3: Critic Agent finalizes with the MetaReviewer assessment
         print("\n[3/3] Critic Agent: Identifying weaknesses and providing feedback...")
-        critic_message = await self.critic.process(reader_output, assessment)
+        critic_message = await self.critic._finalize(critic_analysis, assessment)
         
-        try:
-            critic_output = json.loads(critic_message.content)
-            critique = critic_output.get("critique", {})
-        except json.JSONDecodeError:
-            critique = {}
+        critic_output = critic_message.data or {}
+        critique = critic_output.get("critique", {})
         
         print(f"✓ Critic completed.")
         print(f"  Critical Issues: {critic_output.get('severity_levels', {}).get('critical', 0)}")
@@ -94,6 +129,7 @@ class PaperReviewOrchestrator:
             "agent": "Critic",
             "message": critic_message
         })
+        yield {"stage": "critic", "data": {"critique": critique}}
         
         # Compile final review
         final_review = self._compile_review(
@@ -106,32 +142,73 @@ class PaperReviewOrchestrator:
         print("Review Complete!")
         print(f"{'='*70}\n")
         
-        return final_review
+        yield {"stage": "complete", "data": final_review}
+    
+    @classmethod
+    async def review_papers(cls, paper_paths: List[str], *, max_concurrency: int = 8) -> List[Any]:
+        """
+        Review several papers concurrently.
+        
+        Each paper runs on its own orchestrator so agent and workflow
+        histories stay isolated between reviews.
+        
+        Args:
+            paper_paths: Paths to paper PDFs or paper identifiers
+            max_concurrency: Maximum number of reviews running at once
+        
+        Returns:
+            Reviews in the same order as paper_paths; a review that raised
+            is returned as its exception
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def review_one(paper_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await cls().review_paper(paper_path)
+        
+        return await asyncio.gather(
+            *(review_one(paper_path) for paper_path in paper_paths),
+            return_exceptions=True
+        )
     
     def _compile_review(self, reader_output: dict, assessment: dict, critique: dict) -> dict:
         """Compile all agent outputs into a single review."""
         
+        issues_by_severity = self._partition_issues(critique.get("issues", []))
+        
         return {
             "paper_id": reader_output.get("paper_id"),
             "review_status": "COMPLETE",
-            "reader_extraction": {
-                "summary": reader_output.get("summary", ""),
-                "text_length": reader_output.get("text_length", 0),
-                "sections_identified": len(reader_output.get("sections", {})),
-                "key_insights": reader_output.get("key_insights", [])
-            },
+            "reader_extraction": self._reader_extraction(reader_output),
             "quality_assessment": assessment,
             "critique": critique,
-            "overall_recommendation": self._generate_final_recommendation(assessment, critique),
-            "next_steps": self._generate_next_steps(assessment, critique)
+            "overall_recommendation": self._generate_final_recommendation(assessment, issues_by_severity),
+            "next_steps": self._generate_next_steps(assessment, issues_by_severity)
         }
     
-    def _generate_final_recommendation(self, assessment: dict, critique: dict) -> str:
+    def _reader_extraction(self, reader_output: dict) -> dict:
+        """Summarize the Reader output for the review."""
+        
+        return {
+            "summary": reader_output.get("summary", ""),
+            "text_length": reader_output.get("text_length", 0),
+            "sections_identified": len(reader_output.get("sections", {})),
+            "key_insights": reader_output.get("key_insights", [])
+        }
+    
+    def _partition_issues(self, issues: list) -> dict:
+        """Group critique issues by severity in a single pass."""
+        
+        partition = {"CRITICAL": [], "MAJOR": [], "MINOR": []}
+        for issue in issues:
+            partition.setdefault(issue.get("severity"), []).append(issue)
+        return partition
+    
+    def _generate_final_recommendation(self, assessment: dict, issues_by_severity: dict) -> str:
         """Generate final recommendation based on assessment and critique."""
         
         overall_quality = assessment.get("overall_quality", "UNKNOWN")
-        critical_issues = critique.get("issues", [])
-        critical_count = len([i for i in critical_issues if i.get("severity") == "CRITICAL"])
+        critical_count = len(issues_by_severity["CRITICAL"])
         
         if overall_quality == "EXCELLENT" and critical_count == 0:
             return "ACCEPT"
@@ -142,12 +219,12 @@ class PaperReviewOrchestrator:
         else:
             return "REJECT"
     
-    def _generate_next_steps(self, assessment: dict, critique: dict) -> list:
+    def _generate_next_steps(self, assessment: dict, issues_by_severity: dict) -> list:
         """Generate actionable next steps."""
         
         steps = []
         
-        critical_issues = [i for i in critique.get("issues", []) if i.get("severity") == "CRITICAL"]
+        critical_issues = issues_by_severity["CRITICAL"]
         if critical_issues:
             steps.append({
                 "priority": "HIGH",
@@ -155,7 +232,7 @@ class PaperReviewOrchestrator:
                 "details": [i.get("recommendation", "") for i in critical_issues[:3]]
             })
         
-        major_issues = [i for i in critique.get("issues", []) if i.get("severity") == "MAJOR"]
+        major_issues = issues_by_severity["MAJOR"]
         if major_issues:
             steps.append({
                 "priority": "MEDIUM",
@@ -188,3 +265,9 @@ class PaperReviewOrchestrator:
                 for step in self.workflow_history
             ]
         }
+    
+    def clear_history(self):
+        """Forget the workflow and agent histories of earlier reviews."""
+        self.workflow_history.clear()
+        for agent in (self.reader, self.meta_reviewer, self.critic):
+            agent.clear_history()
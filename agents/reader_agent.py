@@ -1,8 +1,8 @@
 """Reader Agent: Extracts and summarizes paper content."""
 import asyncio
-import json
-from agents.base_agent import BaseAgent, Message
-from agents.tools import extract_pdf_text, extract_sections, load_sample_paper
+from typing import Optional
+from agents.base_agent import BaseAgent, Message, json_dumps
+from agents.tools import extract_pdf_text_async, extract_sections, load_sample_paper_async
 
 
 class ReaderAgent(BaseAgent):
@@ -14,16 +14,18 @@ class ReaderAgent(BaseAgent):
     - Uses: PDF extraction tool, section extraction tool
     """
     
-    def __init__(self):
+    TOOLS = {
+        "extract_pdf": extract_pdf_text_async,
+        "extract_sections": extract_sections,
+        "load_sample_paper": load_sample_paper_async
+    }
+    
+    def __init__(self, history_limit: Optional[int] = None):
         super().__init__(
             name="Reader",
-            role="Content Extractor & Summarizer"
+            role="Content Extractor & Summarizer",
+            history_limit=history_limit
         )
-        
-        # Register tools
-        self.register_tool("extract_pdf", extract_pdf_text)
-        self.register_tool("extract_sections", extract_sections)
-        self.register_tool("load_sample_paper", load_sample_paper)
     
     async def process(self, paper_path: str) -> Message:
         """
@@ -37,8 +39,12 @@ class ReaderAgent(BaseAgent):
         """
         tool_calls = []
         
-        # First, try to load the paper (works with sample papers)
-        load_result = await self.execute_tool("load_sample_paper", paper_id=paper_path)
+        # First, try to load the paper (works with sample papers). PDF paths
+        # never name a sample paper, so they go straight to PDF extraction.
+        if paper_path.lower().endswith(".pdf"):
+            load_result = {}
+        else:
+            load_result = await self.execute_tool("load_sample_paper", paper_id=paper_path)
         
         if load_result.get("success"):
             text = load_result["content"]
@@ -94,7 +100,8 @@ class ReaderAgent(BaseAgent):
         
         response = Message(
             sender=self.name,
-            content=json.dumps(response_content, indent=2),
+            content=json_dumps(response_content),
+            data=response_content,
             tool_calls=tool_calls
         )
         
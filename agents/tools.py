@@ -1,47 +1,229 @@
 """Tools for PDF extraction and text processing."""
+import asyncio
+import hashlib
+import importlib
 import json
 import os
 import re
+from functools import lru_cache
 from typing import Optional
-import PyPDF2
+from agents.base_agent import write_json
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Linear-time RE2 engine for bulk scans when installed
+_scan_re = re2 if re2 is not None else re
 
 
 # Tool 1: PDF Extraction
+# Extraction results keyed by SHA-1 of the PDF bytes
+PDF_CACHE_DIR = "paper_reviewer/data/cache"
+
+# PDF libraries in order of preference. They are slow to import, so the
+# first available one is loaded on first extraction rather than at startup.
+# PyMuPDF is AGPL-licensed, so it is only used when installed explicitly.
+_PDF_BACKENDS = ("pymupdf", "pypdfium2", "pypdf", "PyPDF2")
+_pdf_backend = None
+
+
+def _get_pdf_backend() -> tuple:
+    """Return (name, module) of the first installed PDF library, or (None, None)."""
+    global _pdf_backend
+    if _pdf_backend is None:
+        _pdf_backend = (None, None)
+        for name in _PDF_BACKENDS:
+            try:
+                _pdf_backend = (name, importlib.import_module(name))
+                break
+            except ImportError:
+                continue
+    return _pdf_backend
+
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path: str):
+    """Create a directory once per process."""
+    os.makedirs(path, exist_ok=True)
+
+
+def _read_pdf_cache(cache_path: str) -> Optional[dict]:
+    """Load a cached extraction result, ignoring missing or corrupt entries."""
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_pdf_cache(cache_path: str, result: dict):
+    """Store an extraction result; caching is best effort."""
+    try:
+        _ensure_dir(PDF_CACHE_DIR)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        write_json(tmp_path, result)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _extract_with_pymupdf(pymupdf, pdf_path: str) -> tuple:
+    """Extract page text and metadata with PyMuPDF."""
+    doc = pymupdf.open(pdf_path)
+    try:
+        parts = []
+        for page_num, page in enumerate(doc):
+            parts.append(f"\n--- Page {page_num + 1} ---\n")
+            parts.append(page.get_text("text"))
+        
+        metadata = doc.metadata or {}
+        return "".join(parts), doc.page_count, {
+            "title": metadata.get("title") or "Unknown",
+            "author": metadata.get("author") or "Unknown",
+            "creation_date": metadata.get("creationDate") or "Unknown"
+        }
+    finally:
+        doc.close()
+
+
+def _extract_with_pdfium(pdfium, pdf_path: str) -> tuple:
+    """Extract page text and metadata with PDFium."""
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        parts = []
+        for page_num in range(len(pdf)):
+            parts.append(f"\n--- Page {page_num + 1} ---\n")
+            parts.append(pdf[page_num].get_textpage().get_text_range().replace("\r\n", "\n"))
+        
+        metadata = pdf.get_metadata_dict()
+        return "".join(parts), len(pdf), {
+            "title": metadata.get("Title") or "Unknown",
+            "author": metadata.get("Author") or "Unknown",
+            "creation_date": metadata.get("CreationDate") or "Unknown"
+        }
+    finally:
+        pdf.close()
+
+
+def _extract_with_pypdf(pypdf, pdf_path: str) -> tuple:
+    """Extract page text and metadata with pypdf (or legacy PyPDF2)."""
+    parts = []
+    
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = pypdf.PdfReader(file)
+        metadata = pdf_reader.metadata or {}
+        
+        for page_num, page in enumerate(pdf_reader.pages):
+            parts.append(f"\n--- Page {page_num + 1} ---\n")
+            parts.append(page.extract_text() or "")
+        
+        return "".join(parts), len(pdf_reader.pages), {
+            "title": metadata.get("/Title", "Unknown"),
+            "author": metadata.get("/Author", "Unknown"),
+            "creation_date": metadata.get("/CreationDate", "Unknown")
+        }
+
+
 def extract_pdf_text(pdf_path: str) -> dict:
     """
     Extract text from PDF file.
+    Uses PyMuPDF or PDFium when installed, falling back to pypdf / PyPDF2.
+    Results are cached on disk by file content.
     Used by: Reader Agent
     """
     try:
         if not os.path.exists(pdf_path):
             return {"error": f"PDF not found: {pdf_path}"}
         
-        text = ""
-        metadata = {}
-        
         with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            metadata = pdf_reader.metadata or {}
-            
-            for page_num, page in enumerate(pdf_reader.pages):
-                text += f"\n--- Page {page_num + 1} ---\n"
-                text += page.extract_text()
+            digest = hashlib.sha1(file.read()).hexdigest()
+        cache_path = os.path.join(PDF_CACHE_DIR, f"{digest}.json")
+        cached = _read_pdf_cache(cache_path)
+        if cached is not None:
+            return cached
         
-        return {
+        backend_name, backend = _get_pdf_backend()
+        if backend_name == "pymupdf":
+            text, pages, metadata = _extract_with_pymupdf(backend, pdf_path)
+        elif backend_name == "pypdfium2":
+            text, pages, metadata = _extract_with_pdfium(backend, pdf_path)
+        elif backend is not None:
+            text, pages, metadata = _extract_with_pypdf(backend, pdf_path)
+        else:
+            return {"error": "PDF extraction failed: no PDF library installed (pymupdf, pypdfium2, pypdf or PyPDF2)"}
+        
+        result = {
             "success": True,
             "text": text,
-            "pages": len(pdf_reader.pages),
-            "metadata": {
-                "title": metadata.get("/Title", "Unknown"),
-                "author": metadata.get("/Author", "Unknown"),
-                "creation_date": metadata.get("/CreationDate", "Unknown")
-            }
+            "pages": pages,
+            "metadata": metadata
         }
+        _write_pdf_cache(cache_path, result)
+        return result
     except Exception as e:
         return {"error": f"PDF extraction failed: {str(e)}"}
 
 
 # Tool 2: Section Extraction
+# A section header is a known keyword at the start of a line, either numbered
+# ("1 Introduction", "IV. Results") or alone on its line ("Abstract:")
+_SECTION_HEADER_BODY = (
+    r"[ \t]*(?P<header>(?P<number>(?:\d+(?:\.\d+)*\.?|[IVX]+\.)[ \t]+)?"
+    r"(?P<word>abstract|summary|introduction|method(?:s|ology)?|approach|results?|"
+    r"experiments?|evaluation|findings?|discussion|conclusions?|future\s+work|"
+    r"references?|bibliography)\b)(?P<rest>[^\n]*)"
+)
+# Headers on the first line, and on every later line. Anchoring on a literal
+# newline rather than a multiline ^ lets the engine skip ahead to candidate
+# lines instead of attempting a match at every character.
+_FIRST_SECTION_HEADER = _scan_re.compile(r"(?i)" + _SECTION_HEADER_BODY)
+_SECTION_HEADER = _scan_re.compile(r"(?i)\n" + _SECTION_HEADER_BODY)
+
+# Header keyword -> section name; None marks headers that only end a section
+_HEADER_SECTIONS = {
+    "abstract": "abstract",
+    "summary": "abstract",
+    "introduction": "introduction",
+    "method": "methodology",
+    "methods": "methodology",
+    "methodology": "methodology",
+    "approach": "methodology",
+    "result": "results",
+    "results": "results",
+    "experiment": "results",
+    "experiments": "results",
+    "evaluation": "results",
+    "finding": "results",
+    "findings": "results",
+    "discussion": None,
+    "conclusion": "conclusion",
+    "conclusions": "conclusion",
+    "future work": "conclusion",
+    "reference": "references",
+    "references": "references",
+    "bibliography": "references"
+}
+
+
+def _iter_section_headers(text: str):
+    """Yield header matches in text order."""
+    first = _FIRST_SECTION_HEADER.match(text)
+    if first:
+        yield first
+    yield from _SECTION_HEADER.finditer(text)
+
+
+def _fill_sections(sections: dict, headers: list, text: str):
+    """Fill still-empty sections from (start, section) headers; each runs to the next header."""
+    for i, (start, section) in enumerate(headers):
+        if section is None or sections[section]:
+            continue
+        end = headers[i + 1][0] if i + 1 < len(headers) else len(text)
+        sections[section] = text[start:min(end, start + 500)]  # Limit to 500 chars per section
+
+
 def extract_sections(text: str) -> dict:
     """
     Extract key sections from paper text.
@@ -57,49 +239,64 @@ def extract_sections(text: str) -> dict:
             "references": ""
         }
         
-        # Simple heuristic-based extraction
-        patterns = {
-            "abstract": r"(?i)(abstract|summary)(.*?)(?=introduction|1\.|$)",
-            "introduction": r"(?i)(introduction|1\.)(.*?)(?=method|2\.|$)",
-            "methodology": r"(?i)(method|methodology|approach|2\.)(.*?)(?=result|experiment|3\.|$)",
-            "results": r"(?i)(result|experiment|evaluation|finding|3\.)(.*?)(?=conclusion|4\.|discuss|$)",
-            "conclusion": r"(?i)(conclusion|future work|4\.)(.*?)(?=reference|5\.|$)",
-            "references": r"(?i)(reference|bibliography)(.*?)$"
-        }
+        # Find all lines starting with a section keyword in one pass. Numbered
+        # or standalone keywords are headings; any other keyword line (e.g. a
+        # "Method  H2O  SnapKV" table row) only stands in for a section that
+        # has no heading
+        headings = []
+        keyword_lines = []
+        for match in _iter_section_headers(text):
+            word = " ".join(match.group("word").lower().split())
+            header = (match.start(1), _HEADER_SECTIONS[word])  # header group
+            keyword_lines.append(header)
+            
+            rest = match.group("rest").lstrip()
+            if match.group("number") or not rest or rest.startswith(":"):
+                headings.append(header)
         
-        for section, pattern in patterns.items():
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                sections[section] = match.group(0)[:500]  # Limit to 500 chars per section
+        _fill_sections(sections, headings, text)
+        _fill_sections(sections, keyword_lines, text)
         
         return {
             "success": True,
             "sections": sections,
-            "section_count": len([s for s in sections.values() if s])
+            "section_count": sum(1 for s in sections.values() if s)
         }
     except Exception as e:
         return {"error": f"Section extraction failed: {str(e)}"}
 
 
 # Tool 3: Entity/Citation Extraction
+_CITATION_STYLES = ("bracket_style", "parenthetical", "author_year")
+
+# One alternation over all citation styles so the text is scanned once;
+# the named group that matched identifies the style
+_CITATION_PATTERN = _scan_re.compile(
+    r"\[(?P<bracket_style>\d+)\]"  # [1], [2]
+    r"|\((?P<parenthetical>[A-Z][a-z]+\set\sal\.,?\s?\d{4})\)"  # (Smith et al., 2020)
+    r"|(?P<author_year>[A-Z][a-z]+\s+(?:and\s+)?(?:[A-Z][a-z]+)?\s+\(\d{4}\))"
+)
+
+
 def extract_citations(text: str) -> dict:
     """
     Extract citations from paper text.
     Used by: Reader & Critic Agents
     """
     try:
-        # Simple regex patterns for common citation formats
-        patterns = {
-            "bracket_style": r"\[(\d+)\]",  # [1], [2]
-            "parenthetical": r"\(([A-Z][a-z]+\set\sal\.,?\s?\d{4})\)",  # (Smith et al., 2020)
-            "author_year": r"([A-Z][a-z]+\s+(?:and\s+)?(?:[A-Z][a-z]+)?\s+\(\d{4}\))"
-        }
+        found = {style: [] for style in _CITATION_STYLES}
+        open_styles = len(_CITATION_STYLES)
+        for match in _CITATION_PATTERN.finditer(text):
+            style = match.lastgroup
+            matches = found[style]
+            if len(matches) < 10:  # Top 10 citations per style
+                matches.append(match.group(style))
+                if len(matches) == 10:
+                    open_styles -= 1
+                    if not open_styles:
+                        break  # every style is full; skip the rest of the text
         
-        citations = {}
-        for style, pattern in patterns.items():
-            matches = re.findall(pattern, text)
-            if matches:
-                citations[style] = matches[:10]  # Top 10 citations per style
+        citations = {style: found[style] for style in _CITATION_STYLES if found[style]}
         
         return {
             "success": True,
@@ -111,36 +308,46 @@ def extract_citations(text: str) -> dict:
 
 
 # Tool 4: Text Analysis
+_SENTENCE_SPLIT = _scan_re.compile(r'[.!?]+')
+
+
 def analyze_text_quality(text: str) -> dict:
     """
     Analyze text quality metrics.
     Used by: Critic Agent
     """
     try:
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # Count without materializing stripped sentences or complex words;
+        # str.split stays in C, which beats a per-word regex loop
+        total_sentences = sum(1 for s in _SENTENCE_SPLIT.split(text) if s.strip())
         
         words = text.split()
+        total_words = len(words)
         
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
+        avg_sentence_length = total_words / total_sentences if total_sentences else 0
         
         # Check for clarity issues
-        complex_words = [w for w in words if len(w) > 12]
+        complex_words = sum(1 for w in words if len(w) > 12)
+        complex_word_ratio = complex_words / total_words if total_words else 0
         
-        metrics = {
-            "total_words": len(words),
-            "total_sentences": len(sentences),
-            "avg_sentence_length": round(avg_sentence_length, 2),
-            "complex_word_ratio": round(len(complex_words) / len(words), 3) if words else 0,
-            "readability_score": round(20 - avg_sentence_length / 2, 1)  # Simple readability
-        }
+        # Simple readability, floored at zero for very long sentences
+        readability_score = max(0.0, 20.0 - avg_sentence_length * 0.5)
         
         issues = []
-        if metrics["avg_sentence_length"] > 20:
+        if avg_sentence_length > 20:
             issues.append("Sentences are too long (potential clarity issue)")
-        if metrics["complex_word_ratio"] > 0.15:
+        if complex_word_ratio > 0.15:
             issues.append("Too many complex words (potential readability issue)")
         
+        # Round only for reporting; thresholds above use the exact values
+        metrics = {
+            "total_words": total_words,
+            "total_sentences": total_sentences,
+            "avg_sentence_length": round(avg_sentence_length, 2),
+            "complex_word_ratio": round(complex_word_ratio, 3),
+            "readability_score": round(readability_score, 1)
+        }
+        
         return {
             "success": True,
             "metrics": metrics,
@@ -151,44 +358,71 @@ def analyze_text_quality(text: str) -> dict:
 
 
 # Tool 5: File I/O for saving results
+RESULTS_DIR = "paper_reviewer/data/results"
+
+
 def save_review_result(filename: str, content: dict) -> dict:
     """
     Save review results to file.
     Used by: MetaReviewer Agent
     """
     try:
-        os.makedirs("paper_reviewer/data/results", exist_ok=True)
-        filepath = f"paper_reviewer/data/results/{filename}"
+        _ensure_dir(RESULTS_DIR)
+        filepath = f"{RESULTS_DIR}/{filename}"
         
-        with open(filepath, 'w') as f:
-            json.dump(content, f, indent=2)
+        size_bytes = write_json(filepath, content, indent=True)
         
         return {
             "success": True,
             "filepath": filepath,
-            "size_bytes": os.path.getsize(filepath)
+            "size_bytes": size_bytes
         }
     except Exception as e:
         return {"error": f"File save failed: {str(e)}"}
 
 
 # Tool 6: Load sample papers
+SAMPLE_PAPERS_DIR = "paper_reviewer/data/sample_papers"
+
+
+def sample_paper_path(paper_id: str) -> str:
+    """Path of the sample paper file a paper ID refers to."""
+    return f"{SAMPLE_PAPERS_DIR}/{paper_id}.txt"
+
+
+@lru_cache(maxsize=64)
+def _read_sample_paper(filepath: str, mtime_ns: int) -> str:
+    """Read a sample paper; mtime_ns keys the cache so edits are picked up."""
+    with open(filepath, 'r') as f:
+        return f.read()
+
+
 def load_sample_paper(paper_id: str) -> dict:
     """
     Load sample paper from data directory.
     Used by: Reader Agent
     """
     try:
-        sample_dir = "paper_reviewer/data/sample_papers"
-        os.makedirs(sample_dir, exist_ok=True)
+        os.makedirs(SAMPLE_PAPERS_DIR, exist_ok=True)
         
         # Return a sample paper if it exists
-        filepath = f"{sample_dir}/{paper_id}.txt"
+        filepath = sample_paper_path(paper_id)
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                content = f.read()
+            content = _read_sample_paper(filepath, os.stat(filepath).st_mtime_ns)
             return {"success": True, "content": content}
         else:
             return {"error": f"Paper not found: {paper_id}"}
     except Exception as e:
         return {"error": f"Load paper failed: {str(e)}"}
+
+
+# Async variants of the blocking tools. PDF parsing and file reads run in a
+# worker thread so concurrent reviews keep the event loop free.
+async def extract_pdf_text_async(pdf_path: str) -> dict:
+    """Run extract_pdf_text in a worker thread."""
+    return await asyncio.to_thread(extract_pdf_text, pdf_path)
+
+
+async def load_sample_paper_async(paper_id: str) -> dict:
+    """Run load_sample_paper in a worker thread."""
+    return await asyncio.to_thread(load_sample_paper, paper_id)
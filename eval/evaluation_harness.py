@@ -6,17 +6,23 @@ from typing import Dict, List, Tuple
 import sys
 sys.path.insert(0, 'paper_reviewer')
 
+from agents.base_agent import write_json
 from agents.orchestrator import PaperReviewOrchestrator
 
 
 class EvaluationHarness:
     """Runs test cases and computes metrics."""
     
-    def __init__(self, test_cases_file: str):
+    def __init__(self, test_cases_file: str, max_concurrency: int = 4):
         self.test_cases_file = test_cases_file
+        self.max_concurrency = max_concurrency
         self.test_cases = self._load_test_cases()
-        self.orchestrator = PaperReviewOrchestrator()
         self.results = []
+        
+        # One orchestrator per concurrent test so agent histories never mix
+        self._pool = asyncio.Queue()
+        for _ in range(max_concurrency):
+            self._pool.put_nowait(PaperReviewOrchestrator())
     
     def _load_test_cases(self) -> List[dict]:
         """Load test cases from JSON file."""
@@ -35,13 +41,20 @@ class EvaluationHarness:
         
         print(f"Loading {len(self.test_cases)} test cases...\n")
         
-        for test_case in self.test_cases:
-            await self._run_test(test_case)
+        # Run tests concurrently, keeping results in test case order
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_limited(test_case: dict) -> dict:
+            async with semaphore:
+                return await self._run_test(test_case)
+        
+        results = await asyncio.gather(*(run_limited(tc) for tc in self.test_cases))
+        self.results.extend(results)
         
         return self._compute_aggregate_metrics()
     
-    async def _run_test(self, test_case: dict):
-        """Run a single test case."""
+    async def _run_test(self, test_case: dict) -> dict:
+        """Run a single test case and return its result."""
         test_id = test_case.get("test_id")
         test_name = test_case.get("name")
         paper_id = test_case.get("input", {}).get("paper_id")
@@ -52,8 +65,13 @@ class EvaluationHarness:
         start_time = time.time()
         
         try:
-            # Execute review
-            review_result = await self.orchestrator.review_paper(paper_id)
+            # Execute review on an orchestrator from the pool
+            orchestrator = await self._pool.get()
+            try:
+                review_result = await orchestrator.review_paper(paper_id)
+            finally:
+                orchestrator.clear_history()
+                self._pool.put_nowait(orchestrator)
             
             elapsed_ms = (time.time() - start_time) * 1000
             
@@ -68,10 +86,8 @@ class EvaluationHarness:
                 "validation_details": details
             }
             
-            self.results.append(result)
-            
             status_symbol = "✓" if is_passed else "✗"
-            print(f"  {status_symbol} {result['status']} ({elapsed_ms:.2f}ms)")
+            print(f"[{test_id}] {status_symbol} {result['status']} ({elapsed_ms:.2f}ms)")
             
         except Exception as e:
             elapsed_ms = (time.time() - start_time) * 1000
@@ -82,10 +98,10 @@ class EvaluationHarness:
                 "latency_ms": round(elapsed_ms, 2),
                 "error": str(e)
             }
-            self.results.append(result)
-            print(f"  ✗ ERROR ({elapsed_ms:.2f}ms): {str(e)}")
+            print(f"[{test_id}] ✗ ERROR ({elapsed_ms:.2f}ms): {str(e)}")
         
         print()
+        return result
     
     def _validate_test(self, test_case: dict, output: dict) -> Tuple[bool, dict]:
         """Validate test output against expected values."""
@@ -161,14 +177,28 @@ class EvaluationHarness:
         """Compute aggregate metrics across all tests."""
         
         total_tests = len(self.results)
-        passed_tests = len([r for r in self.results if r["status"] == "PASSED"])
-        failed_tests = len([r for r in self.results if r["status"] == "FAILED"])
-        error_tests = len([r for r in self.results if r["status"] == "ERROR"])
+        passed_tests = failed_tests = error_tests = 0
+        total_latency = 0
+        max_latency = 0
+        min_latency = float("inf")
+        
+        # Tally statuses and latencies in a single pass over the results
+        for r in self.results:
+            status = r["status"]
+            passed_tests += status == "PASSED"
+            failed_tests += status == "FAILED"
+            error_tests += status == "ERROR"
+            
+            latency = r["latency_ms"]
+            total_latency += latency
+            if latency > max_latency:
+                max_latency = latency
+            if latency < min_latency:
+                min_latency = latency
         
-        latencies = [r["latency_ms"] for r in self.results]
-        avg_latency = sum(latencies) / len(latencies) if latencies else 0
-        max_latency = max(latencies) if latencies else 0
-        min_latency = min(latencies) if latencies else 0
+        avg_latency = total_latency / total_tests if total_tests else 0
+        if not total_tests:
+            min_latency = 0
         
         success_rate = passed_tests / total_tests if total_tests > 0 else 0
         
@@ -225,8 +255,7 @@ class EvaluationHarness:
     def save_report(self, metrics: Dict, output_file: str):
         """Save evaluation report to JSON file."""
         try:
-            with open(output_file, 'w') as f:
-                json.dump(metrics, f, indent=2)
+            write_json(output_file, metrics, indent=True)
             print(f"Report saved to: {output_file}")
         except Exception as e:
             print(f"Error saving report: {e}")
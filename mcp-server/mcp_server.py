@@ -2,10 +2,21 @@
 import json
 import asyncio
 from typing import Any, Optional
-from dataclasses import asdict
+from dataclasses import dataclass
 from agents.orchestrator import PaperReviewOrchestrator
 
 
+@dataclass(slots=True)
+class ReviewTask:
+    """State of a submitted review."""
+    status: str
+    paper_path: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    workflow: Optional[dict] = None  # Trace snapshot, set on completion
+    agents_log: Optional[dict] = None
+
+
 class PaperReviewerMCPServer:
     """
     MCP Server exposing paper review agents as services.
@@ -13,10 +24,23 @@ class PaperReviewerMCPServer:
     Implements MCP (Model Context Protocol) for standardized agent communication.
     """
     
-    def __init__(self):
-        self.orchestrator = PaperReviewOrchestrator()
+    def __init__(self, pool_size: int = 4):
+        # Reviews borrow an orchestrator from the pool so concurrent
+        # reviews never share agent or workflow history
+        self._pool = asyncio.Queue()
+        for _ in range(pool_size):
+            self._pool.put_nowait(PaperReviewOrchestrator())
         self.active_reviews = {}
         self.review_counter = 0
+        self._background_tasks = set()
+        # Operation name -> (handler, name of its single parameter)
+        self._ops = {
+            "submit_paper": (self.submit_paper, "paper_path"),
+            "get_status": (self.get_review_status, "task_id"),
+            "execute_review": (self.execute_review, "task_id"),
+            "start_review": (self.start_review, "task_id"),
+            "get_trace": (self.get_workflow_trace, "task_id")
+        }
     
     async def submit_paper(self, paper_path: str) -> dict:
         """
@@ -31,11 +55,7 @@ class PaperReviewerMCPServer:
         self.review_counter += 1
         task_id = f"review_{self.review_counter}"
         
-        self.active_reviews[task_id] = {
-            "status": "QUEUED",
-            "paper_path": paper_path,
-            "result": None
-        }
+        self.active_reviews[task_id] = ReviewTask(status="QUEUED", paper_path=paper_path)
         
         return {
             "task_id": task_id,
@@ -53,9 +73,9 @@ class PaperReviewerMCPServer:
         task = self.active_reviews[task_id]
         return {
             "task_id": task_id,
-            "status": task.get("status"),
-            "paper_path": task.get("paper_path"),
-            "result": task.get("result")
+            "status": task.status,
+            "paper_path": task.paper_path,
+            "result": task.result
         }
     
     async def execute_review(self, task_id: str) -> dict:
@@ -65,16 +85,34 @@ class PaperReviewerMCPServer:
             return {"error": f"Task {task_id} not found"}
         
         task = self.active_reviews[task_id]
-        paper_path = task.get("paper_path")
+        if task.status != "QUEUED":
+            return {"error": f"Task {task_id} is already {task.status}"}
+        
+        task.status = "PROCESSING"
+        return await self._run_review(task_id, task)
+    
+    async def _run_review(self, task_id: str, task: ReviewTask) -> dict:
+        """Run the review of a task already marked PROCESSING and record its outcome."""
+        paper_path = task.paper_path
         
         try:
-            task["status"] = "PROCESSING"
-            
             # Execute review
-            review_result = await self.orchestrator.review_paper(paper_path)
+            orchestrator = await self._pool.get()
+            try:
+                review_result = await orchestrator.review_paper(paper_path)
+                # Snapshot the trace before the orchestrator goes back to the
+                # pool; it is fixed once the review completes
+                workflow = orchestrator.get_workflow_report()
+                agents_log = self._get_agents_log(orchestrator)
+            finally:
+                # The next borrower must only see its own review in the trace
+                orchestrator.clear_history()
+                self._pool.put_nowait(orchestrator)
             
-            task["status"] = "COMPLETED"
-            task["result"] = review_result
+            task.status = "COMPLETED"
+            task.result = review_result
+            task.workflow = workflow
+            task.agents_log = agents_log
             
             return {
                 "task_id": task_id,
@@ -83,14 +121,40 @@ class PaperReviewerMCPServer:
             }
         
         except Exception as e:
-            task["status"] = "FAILED"
-            task["error"] = str(e)
+            task.status = "FAILED"
+            task.error = str(e)
             return {
                 "task_id": task_id,
                 "status": "FAILED",
                 "error": str(e)
             }
     
+    async def start_review(self, task_id: str) -> dict:
+        """
+        Start a submitted review in the background and return immediately.
+        
+        Poll get_review_status with the task ID to collect the result.
+        """
+        
+        if task_id not in self.active_reviews:
+            return {"error": f"Task {task_id} not found"}
+        
+        task = self.active_reviews[task_id]
+        if task.status != "QUEUED":
+            return {"error": f"Task {task_id} is already {task.status}"}
+        
+        task.status = "PROCESSING"
+        background = asyncio.create_task(self._run_review(task_id, task))
+        # Keep a reference so the task is not garbage collected mid-review
+        self._background_tasks.add(background)
+        background.add_done_callback(self._background_tasks.discard)
+        
+        return {
+            "task_id": task_id,
+            "status": "PROCESSING",
+            "message": "Review started"
+        }
+    
     async def get_workflow_trace(self, task_id: str) -> dict:
         """Get detailed workflow trace for a completed review."""
         
@@ -99,37 +163,39 @@ class PaperReviewerMCPServer:
         
         task = self.active_reviews[task_id]
         
-        if task.get("status") != "COMPLETED":
+        if task.status != "COMPLETED":
             return {"error": f"Task {task_id} is not completed"}
         
-        workflow = self.orchestrator.get_workflow_report()
-        
         return {
             "task_id": task_id,
-            "workflow": workflow,
-            "agents_log": self._get_agents_log()
+            "workflow": task.workflow,
+            "agents_log": task.agents_log
         }
     
-    def _get_agents_log(self) -> dict:
-        """Get logs from all agents."""
+    # agents_log key -> orchestrator attribute holding that agent
+    _LOGGED_AGENTS = (
+        ("reader_agent", "reader"),
+        ("meta_reviewer_agent", "meta_reviewer"),
+        ("critic_agent", "critic")
+    )
+    
+    def _get_agents_log(self, orchestrator: PaperReviewOrchestrator) -> dict:
+        """
+        Get logs from all agents of an orchestrator.
         
-        return {
-            "reader_agent": {
-                "name": self.orchestrator.reader.name,
-                "role": self.orchestrator.reader.role,
-                "history_length": len(self.orchestrator.reader.conversation_history)
-            },
-            "meta_reviewer_agent": {
-                "name": self.orchestrator.meta_reviewer.name,
-                "role": self.orchestrator.meta_reviewer.role,
-                "history_length": len(self.orchestrator.meta_reviewer.conversation_history)
-            },
-            "critic_agent": {
-                "name": self.orchestrator.critic.name,
-                "role": self.orchestrator.critic.role,
-                "history_length": len(self.orchestrator.critic.conversation_history)
+        Called once per completed review; the result is stored on the task
+        and served as-is by get_workflow_trace.
+        """
+        
+        agents_log = {}
+        for key, attr in self._LOGGED_AGENTS:
+            agent = getattr(orchestrator, attr)
+            agents_log[key] = {
+                "name": agent.name,
+                "role": agent.role,
+                "history_length": len(agent.conversation_history)
             }
-        }
+        return agents_log
     
     async def handle_request(self, request: dict) -> dict:
         """
@@ -139,23 +205,16 @@ class PaperReviewerMCPServer:
         - submit_paper: Submit paper for review
         - get_status: Check review status
         - execute_review: Run the review
+        - start_review: Run the review in the background
         - get_trace: Get workflow details
         """
         
         operation = request.get("operation")
         params = request.get("params", {})
         
-        if operation == "submit_paper":
-            return await self.submit_paper(params.get("paper_path"))
-        
-        elif operation == "get_status":
-            return await self.get_review_status(params.get("task_id"))
-        
-        elif operation == "execute_review":
-            return await self.execute_review(params.get("task_id"))
-        
-        elif operation == "get_trace":
-            return await self.get_workflow_trace(params.get("task_id"))
-        
-        else:
+        op = self._ops.get(operation)
+        if op is None:
             return {"error": f"Unknown operation: {operation}"}
+        
+        handler, param = op
+        return await handler(params.get(param))
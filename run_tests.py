@@ -5,11 +5,30 @@ import asyncio
 
 sys.path.insert(0, 'paper_reviewer')
 
-from eval.evaluation_harness import EvaluationHarness
+
+async def check_scheduler_stop() -> bool:
+    """Check that stop() releases a paper whose batch is still being collected."""
+    from agents.batch_scheduler import ReviewBatchScheduler
+    
+    scheduler = ReviewBatchScheduler(batch_size=4, max_wait=5.0)
+    submission = asyncio.create_task(scheduler.submit("sample_paper_1"))
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+    
+    try:
+        await asyncio.wait_for(submission, timeout=1.0)
+    except asyncio.CancelledError:
+        return True
+    except asyncio.TimeoutError:
+        pass
+    return False
 
 
 async def main():
     """Run evaluation harness."""
+    # Imported here so the agent stack only loads when tests actually run
+    from eval.evaluation_harness import EvaluationHarness
+    
     test_cases_file = "eval/test_cases.json"
     output_file = "eval/evaluation_report.json"
     
@@ -23,9 +42,13 @@ async def main():
     harness.print_report(metrics)
     harness.save_report(metrics, output_file)
     
-    return metrics
+    scheduler_ok = await check_scheduler_stop()
+    print(f"Batch scheduler stop check: {'PASSED' if scheduler_ok else 'FAILED'}")
+    
+    return metrics, scheduler_ok
 
 
 if __name__ == "__main__":
-    metrics = asyncio.run(main())
-    sys.exit(0 if metrics["summary"]["passed"] == metrics["summary"]["total_tests"] else 1)
+    metrics, scheduler_ok = asyncio.run(main())
+    all_passed = metrics["summary"]["passed"] == metrics["summary"]["total_tests"]
+    sys.exit(0 if all_passed and scheduler_ok else 1)
@@ -6,16 +6,16 @@ Just: python simple_demo.py
 import sys
 import os
 import asyncio
-import json
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Now import
-from agents.orchestrator import PaperReviewOrchestrator
-
 
 async def main():
+    # Imported here so the agent stack only loads when the demo runs
+    from agents.base_agent import write_json
+    from agents.orchestrator import PaperReviewOrchestrator
+    
     print("\n" + "="*70)
     print("PAPER REVIEWER DEMO")
     print("="*70 + "\n")
@@ -51,8 +51,7 @@ async def main():
     print("\n" + "="*70 + "\n")
     
     # Save results
-    with open("review_output.json", "w") as f:
-        json.dump(review, f, indent=2)
+    write_json("review_output.json", review, indent=True)
     print("✅ Review saved to review_output.json")
 
 
@@ -1,33 +1,202 @@
 """Streamlit UI for Multi-Agent Paper Reviewer."""
 import streamlit as st
+import altair as alt
 import asyncio
+import hashlib
+import html
 import json
-from io import StringIO
+import sqlite3
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from types import MappingProxyType
+from typing import Optional
 import sys
 import os
+import time
 
-# Get the absolute path to paper_reviewer directory
-script_dir = os.path.dirname(os.path.abspath(__file__))  # ui/ directory
-parent_dir = os.path.dirname(script_dir)  # paper_reviewer/ directory
-grandparent_dir = os.path.dirname(parent_dir)  # parent of paper_reviewer
+# libuv-backed event loop for asyncio.run when available (not on Windows)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
-# Add both paths to ensure imports work
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
-if grandparent_dir not in sys.path:
-    sys.path.insert(0, grandparent_dir)
+# `streamlit run` only puts ui/ on the path; the agents package lives in
+# the project root above it
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
+from agents.base_agent import json_dumpb
 from agents.orchestrator import PaperReviewOrchestrator
+from agents.tools import sample_paper_path
+
+# Completed reviews kept per session, least recently used evicted first
+REVIEW_CACHE_SIZE = 64
+
+# Completed reviews persisted across sessions and restarts, keyed like the cache
+HISTORY_DB = "paper_reviewer/data/reviews.db"
+HISTORY_LIMIT = 10
+
+# Shared read-only default for missing review sections
+EMPTY = MappingProxyType({})
+
+# Status markers; values not listed fall back to the default at each use
+SEVERITY_COLOR = {"CRITICAL": "🔴", "MAJOR": "🟠", "MINOR": "🟡"}
+PRIORITY_COLOR = {"HIGH": "🔴", "MEDIUM": "🟠", "LOW": "🟢"}
+RECOMMENDATION_COLOR = {
+    "ACCEPT": "🟢",
+    "ACCEPT_WITH_MINOR_REVISIONS": "🟡",
+    "MAJOR_REVISIONS_REQUIRED": "🟡"
+}
+
+# Plain-text export layout; fields are filled by format_review_as_text
+SEP = "=" * 70
+REVIEW_TEXT_TEMPLATE = f"""{SEP}
+MULTI-AGENT PAPER REVIEW
+{SEP}
+
+Paper ID: {{paper_id}}
+Status: {{status}}
+
+{SEP}
+SUMMARY
+{SEP}
+
+Summary:
+{{summary}}
+
+{SEP}
+QUALITY ASSESSMENT
+{SEP}
+Overall Quality: {{overall_quality}}
+Novelty Score: {{novelty}}/10
+Methodology Score: {{methodology}}/10
+Average Score: {{average}}/10
+
+{SEP}
+CRITIQUE
+{SEP}{{issues}}
+
+{SEP}
+RECOMMENDATION
+{SEP}
+
+{{recommendation}}"""
+
+# Metric rows rendered as one HTML element instead of a column and an
+# st.metric delta per value
+METRIC_GRID = '<div style="display:grid;grid-template-columns:repeat({count},1fr);gap:1rem;margin-bottom:1rem">{cards}</div>'
+METRIC_CARD = (
+    '<div><div style="font-size:0.875rem;opacity:0.7">{label}</div>'
+    '<div style="font-size:2rem;line-height:1.4">{value}</div>{delta}</div>'
+)
+METRIC_DELTA = '<div style="font-size:0.875rem;color:#09ab3b">↑ {delta}</div>'
+
+
+def metric_cards_html(metrics: tuple) -> str:
+    """Build a row of metric cards from (label, value) or (label, value, delta) tuples."""
+    cards = "".join(
+        METRIC_CARD.format(
+            label=html.escape(str(label)),
+            value=html.escape(str(value)),
+            delta=METRIC_DELTA.format(delta=html.escape(str(delta[0]))) if delta else ""
+        )
+        for label, value, *delta in metrics
+    )
+    return METRIC_GRID.format(count=len(metrics), cards=cards)
+
+
+HEADER_METRICS_HTML = metric_cards_html((
+    ("Reader Agent", "Active", "Extraction"),
+    ("MetaReviewer", "Active", "Assessment"),
+    ("Critic Agent", "Active", "Feedback")
+))
+
+# The workflow trace is the same for every review, so its markup is built once
+WORKFLOW_STEPS = (
+    ("Reader", "Content Extraction"),
+    ("MetaReviewer", "Quality Assessment"),
+    ("Critic", "Issue Identification")
+)
+WORKFLOW_HTML = "".join(
+    f'<div style="margin-bottom:1rem"><strong>Step {i}: {agent}</strong>'
+    f'<div style="font-size:0.875rem;opacity:0.7">Role: {role}</div>'
+    f'<progress value="{i}" max="{len(WORKFLOW_STEPS)}" style="width:100%"></progress>'
+    f'<div style="font-size:0.875rem">{i}/{len(WORKFLOW_STEPS)} complete</div></div>'
+    for i, (agent, role) in enumerate(WORKFLOW_STEPS, 1)
+)
+
+
+@st.cache_resource
+def get_review_executor() -> ThreadPoolExecutor:
+    """Get the worker pool running reviews in the background for all sessions."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="review")
+
+
+@st.cache_resource
+def init_history_db() -> str:
+    """Create the review history database once per process and return its path."""
+    os.makedirs(os.path.dirname(HISTORY_DB), exist_ok=True)
+    with closing(sqlite3.connect(HISTORY_DB)) as conn:
+        # WAL lets sessions read history while another session writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS reviews "
+            "(key TEXT PRIMARY KEY, paper TEXT, review BLOB, ts REAL)"
+        )
+        conn.commit()
+    return HISTORY_DB
+
+
+def save_review(key: str, paper_path: str, review: dict):
+    """Persist a completed review; history is best effort."""
+    try:
+        with closing(sqlite3.connect(init_history_db())) as conn:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?)",
+                    (key, paper_path, json_dumpb(review), time.time())
+                )
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def load_review(key: str) -> Optional[dict]:
+    """Load a persisted review by cache key, or None."""
+    try:
+        with closing(sqlite3.connect(init_history_db())) as conn:
+            row = conn.execute("SELECT review FROM reviews WHERE key = ?", (key,)).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    if row is None:
+        return None
+    review = json.loads(row[0])
+    # Skip failed reviews persisted before they were excluded
+    return review if is_reusable_review(review) else None
+
+
+def load_review_history(limit: int = HISTORY_LIMIT) -> list:
+    """Get the most recently reviewed papers, newest first."""
+    try:
+        with closing(sqlite3.connect(init_history_db())) as conn:
+            rows = conn.execute(
+                "SELECT paper, ts FROM reviews ORDER BY ts DESC LIMIT ?", (limit,)
+            ).fetchall()
+    except (sqlite3.Error, OSError):
+        return []
+    return [{"paper": paper, "timestamp": ts} for paper, ts in rows]
 
 
 def initialize_session_state():
     """Initialize session state variables."""
-    if 'orchestrator' not in st.session_state:
-        st.session_state.orchestrator = PaperReviewOrchestrator()
     if 'current_review' not in st.session_state:
         st.session_state.current_review = None
-    if 'review_history' not in st.session_state:
-        st.session_state.review_history = []
+    if 'review_cache' not in st.session_state:
+        st.session_state.review_cache = OrderedDict()
+    if 'pending_review' not in st.session_state:
+        st.session_state.pending_review = None
 
 
 def render_header():
@@ -35,14 +204,18 @@ def render_header():
     st.set_page_config(page_title="Multi-Agent Paper Reviewer", layout="wide")
     st.title("📚 Multi-Agent Research Paper Reviewer")
     st.markdown("---")
-    
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Reader Agent", "Active", "Extraction")
-    with col2:
-        st.metric("MetaReviewer", "Active", "Assessment")
-    with col3:
-        st.metric("Critic Agent", "Active", "Feedback")
+    st.markdown(HEADER_METRICS_HTML, unsafe_allow_html=True)
+
+
+def render_history_sidebar():
+    """Render recently reviewed papers from the history database."""
+    history = load_review_history()
+    if history:
+        st.sidebar.subheader("🕘 Recent Reviews")
+        st.sidebar.markdown("\n".join(
+            f"- `{entry['paper']}` ({time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['timestamp']))})"
+            for entry in history
+        ))
 
 
 def render_input_section():
@@ -64,70 +237,177 @@ def render_input_section():
     return paper_input, submit_button
 
 
-async def execute_review(paper_path: str):
-    """Execute paper review."""
-    with st.spinner("🔄 Reviewing paper... This may take a moment."):
+def review_cache_key(paper_path: str) -> str:
+    """
+    Cache key for a paper: content hash of the file it resolves to, else the paper ID.
+    
+    Paper IDs resolve to their sample paper like in ReaderAgent, so an
+    edited sample gets a new key and is reviewed again.
+    """
+    filepath = paper_path
+    if not paper_path.lower().endswith(".pdf") and os.path.isfile(sample_paper_path(paper_path)):
+        filepath = sample_paper_path(paper_path)
+    if os.path.isfile(filepath):
+        with open(filepath, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    return paper_path
+
+
+def is_reusable_review(review: dict) -> bool:
+    """Whether a review may be cached: the Reader extracted some text."""
+    return review.get("reader_extraction", {}).get("text_length", 0) > 0
+
+
+async def run_review(paper_path: str, partial_review: dict) -> dict:
+    """
+    Review a paper on a worker thread, merging each agent's result into partial_review.
+    
+    Each review gets its own orchestrator, which is cheap to build, so
+    reviews from different sessions run concurrently without sharing
+    workflow or agent history. partial_review is read by
+    render_pending_review to preview finished agents.
+    """
+    orchestrator = PaperReviewOrchestrator()
+    async for event in orchestrator.review_paper_streaming(paper_path):
+        if event["stage"] != "complete":
+            partial_review.update(event["data"])
+    return event["data"]  # The last event carries the complete review
+
+
+def start_review(paper_path: str):
+    """Start a background review, reusing the cached review of a resubmitted paper."""
+    cache = st.session_state.review_cache
+    key = review_cache_key(paper_path)
+    if key in cache:
+        cache.move_to_end(key)
+        st.session_state.current_review = cache[key]
+        return
+    
+    review = load_review(key)
+    if review is not None:
+        cache[key] = review
+        if len(cache) > REVIEW_CACHE_SIZE:
+            cache.popitem(last=False)
+        st.session_state.current_review = review
+        return
+    
+    if st.session_state.get("pending_review") is not None:
+        st.info("A review is already running; wait for it to finish.")
+        return
+    
+    partial_review = {}
+    future = get_review_executor().submit(asyncio.run, run_review(paper_path, partial_review))
+    st.session_state.pending_review = (paper_path, key, future, partial_review)
+
+
+def finish_review(paper_path: str, key: str, review: dict):
+    """
+    Store a completed review as current, in the cache and in the history.
+    
+    Reviews of papers that could not be read are only shown, so the paper
+    is reviewed again once it exists.
+    """
+    st.session_state.current_review = review
+    if not is_reusable_review(review):
+        return
+    
+    cache = st.session_state.review_cache
+    cache[key] = review
+    if len(cache) > REVIEW_CACHE_SIZE:
+        cache.popitem(last=False)
+    save_review(key, paper_path, review)
+
+
+@st.fragment(run_every=0.5)
+def render_pending_review():
+    """
+    Poll the background review, previewing each agent's section as it finishes.
+    
+    Only this fragment reruns while polling, so the rest of the page stays
+    interactive; the whole app reruns once the review completes.
+    """
+    pending = st.session_state.get("pending_review")
+    if pending is None:
+        return
+    
+    paper_path, key, future, partial_review = pending
+    if future.done():
+        st.session_state.pending_review = None
         try:
-            review = await st.session_state.orchestrator.review_paper(paper_path)
-            st.session_state.current_review = review
-            st.session_state.review_history.append({
-                "paper": paper_path,
-                "review": review
-            })
-            return review
+            finish_review(paper_path, key, future.result())
         except Exception as e:
-            st.error(f"Error during review: {str(e)}")
-            return None
+            st.session_state.review_error = f"Error during review: {str(e)}"
+        st.rerun()
+    
+    # Snapshot, since the worker thread keeps merging into partial_review
+    partial_review = dict(partial_review)
+    previews = [
+        render
+        for section, render in (
+            ("reader_extraction", render_extraction_section),
+            ("quality_assessment", render_assessment_section),
+            ("critique", render_critique_section)
+        )
+        if section in partial_review
+    ]
+    
+    if not future.running():
+        st.info(f"⏳ {paper_path} is queued behind other reviews...")
+        return
+    
+    st.info(f"🔄 Reviewing {paper_path}... {len(previews)}/3 agents finished.")
+    for render in previews:
+        render(partial_review)
 
 
 def render_summary_section(review: dict):
     """Render summary section."""
     st.subheader("📊 Review Summary")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        quality = review.get("quality_assessment", {}).get("overall_quality", "UNKNOWN")
-        st.metric("Overall Quality", quality)
-    
-    with col2:
-        novelty = review.get("quality_assessment", {}).get("novelty_score", 0)
-        st.metric("Novelty Score", f"{novelty}/10")
-    
-    with col3:
-        methodology = review.get("quality_assessment", {}).get("methodology_score", 0)
-        st.metric("Methodology Score", f"{methodology}/10")
-    
-    with col4:
-        recommendation = review.get("overall_recommendation", "UNKNOWN")
-        color = "🟢" if recommendation == "ACCEPT" else "🟡" if "REVISIONS" in recommendation else "🔴"
-        st.metric("Recommendation", f"{color} {recommendation}")
+    assessment = review.get("quality_assessment") or EMPTY
+    quality = assessment.get("overall_quality", "UNKNOWN")
+    novelty = assessment.get("novelty_score", 0)
+    methodology = assessment.get("methodology_score", 0)
+    recommendation = review.get("overall_recommendation", "UNKNOWN")
+    color = RECOMMENDATION_COLOR.get(recommendation, "🔴")
+    
+    st.markdown(metric_cards_html((
+        ("Overall Quality", quality),
+        ("Novelty Score", f"{novelty}/10"),
+        ("Methodology Score", f"{methodology}/10"),
+        ("Recommendation", f"{color} {recommendation}")
+    )), unsafe_allow_html=True)
 
 
 def render_assessment_section(review: dict):
     """Render detailed assessment."""
     st.subheader("📋 Quality Assessment")
     
-    assessment = review.get("quality_assessment", {})
+    assessment = review.get("quality_assessment") or EMPTY
+    details = assessment.get("assessment_details") or EMPTY
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.write("**Assessment Scores:**")
-        scores_data = {
-            "Novelty": assessment.get("novelty_score", 0),
-            "Methodology": assessment.get("methodology_score", 0),
-            "Citations": assessment.get("citation_score", 0),
-            "Completeness": assessment.get("completeness_score", 0),
-            "Overall": assessment.get("average_score", 0)
-        }
+        scores_data = [
+            {"metric": "Novelty", "score": assessment.get("novelty_score", 0)},
+            {"metric": "Methodology", "score": assessment.get("methodology_score", 0)},
+            {"metric": "Citations", "score": assessment.get("citation_score", 0)},
+            {"metric": "Completeness", "score": assessment.get("completeness_score", 0)},
+            {"metric": "Overall", "score": assessment.get("average_score", 0)}
+        ]
         
-        for metric, score in scores_data.items():
-            st.progress(min(score / 10, 1.0), text=f"{metric}: {score}/10")
+        # One chart element for all scores, on a fixed 0-10 scale
+        chart = alt.Chart(alt.Data(values=scores_data)).mark_bar().encode(
+            x=alt.X("score:Q", title=None, scale=alt.Scale(domain=[0, 10])),
+            y=alt.Y("metric:N", title=None, sort=None),
+            tooltip=["metric:N", "score:Q"]
+        ).properties(height=180)
+        st.altair_chart(chart, use_container_width=True)
     
     with col2:
         st.write("**Assessment Details:**")
-        details = assessment.get("assessment_details", {})
         for key, value in details.items():
             st.write(f"• **{key}**: {value}")
 
@@ -136,42 +416,49 @@ def render_critique_section(review: dict):
     """Render critique section."""
     st.subheader("🔍 Detailed Critique")
     
-    critique = review.get("critique", {})
-    issues = critique.get("issues", [])
+    critique = review.get("critique") or EMPTY
+    issues = critique.get("issues", ())
+    
+    # Issue summary, counted in a single pass
+    severity_counts = Counter(i.get("severity") for i in issues)
     
-    # Issue summary
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        critical_count = len([i for i in issues if i.get("severity") == "CRITICAL"])
-        st.metric("Critical Issues", critical_count, delta=None)
+        st.metric("Critical Issues", severity_counts["CRITICAL"], delta=None)
     
     with col2:
-        major_count = len([i for i in issues if i.get("severity") == "MAJOR"])
-        st.metric("Major Issues", major_count, delta=None)
+        st.metric("Major Issues", severity_counts["MAJOR"], delta=None)
     
     with col3:
-        minor_count = len([i for i in issues if i.get("severity") == "MINOR"])
-        st.metric("Minor Issues", minor_count, delta=None)
+        st.metric("Minor Issues", severity_counts["MINOR"], delta=None)
     
     # Issues list
     if issues:
         st.write("**Issues Found:**")
         
+        # One markdown element with native <details> blocks rather than an
+        # expander and several writes per issue
+        parts = []
         for issue in issues:
             severity = issue.get("severity", "UNKNOWN")
-            category = issue.get("category", "UNKNOWN")
+            category = html.escape(issue.get("category", "UNKNOWN"))
             issue_text = issue.get("issue", "")
             recommendation = issue.get("recommendation", "")
             
-            severity_color = "🔴" if severity == "CRITICAL" else "🟠" if severity == "MAJOR" else "🟡"
+            severity_color = SEVERITY_COLOR.get(severity, "🟡")
             
-            with st.expander(f"{severity_color} [{category}] {issue_text[:60]}..."):
-                st.write(f"**Severity:** {severity}")
-                st.write(f"**Category:** {category}")
-                st.write(f"**Issue:** {issue_text}")
-                if recommendation:
-                    st.write(f"**Recommendation:** {recommendation}")
+            parts.append(
+                f"<details><summary>{severity_color} [{category}] {html.escape(issue_text[:60])}...</summary>\n\n"
+                f"**Severity:** {html.escape(severity)}\n\n"
+                f"**Category:** {category}\n\n"
+                f"**Issue:** {html.escape(issue_text)}\n\n"
+            )
+            if recommendation:
+                parts.append(f"**Recommendation:** {html.escape(recommendation)}\n\n")
+            parts.append("</details>\n\n")
+        
+        st.markdown("".join(parts), unsafe_allow_html=True)
     else:
         st.success("✓ No significant issues found!")
 
@@ -180,15 +467,16 @@ def render_recommendations_section(review: dict):
     """Render recommendations section."""
     st.subheader("💡 Recommendations & Next Steps")
     
-    next_steps = review.get("next_steps", [])
+    next_steps = review.get("next_steps", ())
+    recommendation = review.get("overall_recommendation", "UNKNOWN")
     
     if next_steps:
         for step in next_steps:
             priority = step.get("priority", "UNKNOWN")
             action = step.get("action", "")
-            details = step.get("details", [])
+            details = step.get("details", ())
             
-            priority_color = "🔴" if priority == "HIGH" else "🟠" if priority == "MEDIUM" else "🟢"
+            priority_color = PRIORITY_COLOR.get(priority, "🟢")
             
             with st.expander(f"{priority_color} [{priority}] {action}"):
                 if details:
@@ -196,13 +484,11 @@ def render_recommendations_section(review: dict):
                         st.write(f"• {detail}")
     
     # Overall recommendation
-    recommendation = review.get("overall_recommendation", "UNKNOWN")
-    
     st.markdown("---")
     
     if recommendation == "ACCEPT":
         st.success(f"✅ **Recommendation: ACCEPT**\n\nThis paper is ready for publication.")
-    elif "MINOR_REVISIONS" in recommendation:
+    elif recommendation == "ACCEPT_WITH_MINOR_REVISIONS":
         st.info(f"ℹ️ **Recommendation: {recommendation}**\n\nAddress minor issues to strengthen the paper.")
     elif recommendation == "MAJOR_REVISIONS_REQUIRED":
         st.warning(f"⚠️ **Recommendation: {recommendation}**\n\nSignificant improvements needed before resubmission.")
@@ -214,59 +500,71 @@ def render_extraction_section(review: dict):
     """Render extraction section."""
     st.subheader("📖 Paper Extraction")
     
-    extraction = review.get("reader_extraction", {})
+    extraction = review.get("reader_extraction") or EMPTY
+    summary = extraction.get("summary", "N/A")
+    text_length = extraction.get("text_length", 0)
+    sections_identified = extraction.get("sections_identified", 0)
+    insights = extraction.get("key_insights", ())
     
-    st.write(f"**Summary:**\n{extraction.get('summary', 'N/A')}")
+    st.write(f"**Summary:**\n{summary}")
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Text Length", f"{extraction.get('text_length', 0):,} chars")
-    with col2:
-        st.metric("Sections Found", extraction.get("sections_identified", 0))
-    with col3:
-        insights = extraction.get("key_insights", [])
-        st.metric("Key Insights", len(insights))
+    st.markdown(metric_cards_html((
+        ("Text Length", f"{text_length:,} chars"),
+        ("Sections Found", sections_identified),
+        ("Key Insights", len(insights))
+    )), unsafe_allow_html=True)
 
 
 def render_workflow_section(review: dict):
     """Render workflow trace."""
     st.subheader("🔄 Workflow Trace")
-    
-    workflow_steps = [
-        {"agent": "Reader", "role": "Content Extraction"},
-        {"agent": "MetaReviewer", "role": "Quality Assessment"},
-        {"agent": "Critic", "role": "Issue Identification"}
-    ]
-    
-    for i, step in enumerate(workflow_steps, 1):
-        st.write(f"**Step {i}: {step['agent']}**")
-        st.caption(f"Role: {step['role']}")
-        st.progress((i / len(workflow_steps)), text=f"{i}/{len(workflow_steps)} complete")
+    st.markdown(WORKFLOW_HTML, unsafe_allow_html=True)
+
+
+def get_download_payloads(review: dict) -> tuple:
+    """
+    Get the (JSON bytes, text) exports of a review.
+    
+    Streamlit reruns the script on every interaction, so the exports are
+    kept in session state and rebuilt only when the review changes.
+    """
+    cached = st.session_state.get("download_payloads")
+    if cached is None or cached[0] is not review:
+        cached = (review, json_dumpb(review, indent=True), format_review_as_text(review))
+        st.session_state.download_payloads = cached
+    return cached[1], cached[2]
 
 
+@st.fragment
 def render_download_section(review: dict):
-    """Render download section."""
+    """
+    Render download section.
+    
+    Clicking a download button reruns the script; as a fragment, only this
+    section reruns instead of every tab.
+    """
     st.subheader("📥 Export Review")
     
+    json_bytes, text_str = get_download_payloads(review)
+    file_stem = f"review_{review.get('paper_id', 'paper')}"
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Export as JSON
-        json_str = json.dumps(review, indent=2)
         st.download_button(
             label="📄 Download as JSON",
-            data=json_str,
-            file_name=f"review_{review.get('paper_id', 'paper')}.json",
+            data=json_bytes,
+            file_name=f"{file_stem}.json",
             mime="application/json"
         )
     
     with col2:
         # Export as formatted text
-        text_str = format_review_as_text(review)
         st.download_button(
             label="📝 Download as Text",
             data=text_str,
-            file_name=f"review_{review.get('paper_id', 'paper')}.txt",
+            file_name=f"{file_stem}.txt",
             mime="text/plain"
         )
 
@@ -274,61 +572,48 @@ def render_download_section(review: dict):
 def format_review_as_text(review: dict) -> str:
     """Format review as readable text."""
     
-    lines = [
-        "=" * 70,
-        "MULTI-AGENT PAPER REVIEW",
-        "=" * 70,
-        f"\nPaper ID: {review.get('paper_id')}",
-        f"Status: {review.get('review_status')}",
-        "\n" + "=" * 70,
-        "SUMMARY",
-        "=" * 70,
-    ]
-    
-    extraction = review.get("reader_extraction", {})
-    lines.append(f"\nSummary:\n{extraction.get('summary', 'N/A')}")
-    
-    assessment = review.get("quality_assessment", {})
-    lines.append("\n" + "=" * 70)
-    lines.append("QUALITY ASSESSMENT")
-    lines.append("=" * 70)
-    lines.append(f"Overall Quality: {assessment.get('overall_quality', 'UNKNOWN')}")
-    lines.append(f"Novelty Score: {assessment.get('novelty_score', 0)}/10")
-    lines.append(f"Methodology Score: {assessment.get('methodology_score', 0)}/10")
-    lines.append(f"Average Score: {assessment.get('average_score', 0)}/10")
-    
-    critique = review.get("critique", {})
-    lines.append("\n" + "=" * 70)
-    lines.append("CRITIQUE")
-    lines.append("=" * 70)
-    
-    issues = critique.get("issues", [])
-    for issue in issues:
-        lines.append(f"\n- [{issue.get('severity')}] {issue.get('issue')}")
-        if issue.get("recommendation"):
-            lines.append(f"  Recommendation: {issue.get('recommendation')}")
-    
-    lines.append("\n" + "=" * 70)
-    lines.append("RECOMMENDATION")
-    lines.append("=" * 70)
-    lines.append(f"\n{review.get('overall_recommendation', 'UNKNOWN')}")
-    
-    return "\n".join(lines)
+    extraction = review.get("reader_extraction") or EMPTY
+    assessment = review.get("quality_assessment") or EMPTY
+    critique = review.get("critique") or EMPTY
+    
+    issues = "".join(
+        f"\n\n- [{issue.get('severity')}] {issue.get('issue')}"
+        + (f"\n  Recommendation: {issue['recommendation']}" if issue.get("recommendation") else "")
+        for issue in critique.get("issues", ())
+    )
+    
+    return REVIEW_TEXT_TEMPLATE.format(
+        paper_id=review.get("paper_id"),
+        status=review.get("review_status"),
+        summary=extraction.get("summary", "N/A"),
+        overall_quality=assessment.get("overall_quality", "UNKNOWN"),
+        novelty=assessment.get("novelty_score", 0),
+        methodology=assessment.get("methodology_score", 0),
+        average=assessment.get("average_score", 0),
+        issues=issues,
+        recommendation=review.get("overall_recommendation", "UNKNOWN")
+    )
 
 
 def main():
     """Main app function."""
     initialize_session_state()
     render_header()
+    render_history_sidebar()
     
     # Input section
     paper_input, submit_button = render_input_section()
     
-    # Execute review if button pressed
+    # Start review in the background if button pressed
     if submit_button and paper_input:
-        review = asyncio.run(execute_review(paper_input))
-        if review:
-            st.session_state.current_review = review
+        start_review(paper_input)
+    
+    if st.session_state.pending_review is not None:
+        render_pending_review()
+    
+    review_error = st.session_state.pop("review_error", None)
+    if review_error:
+        st.error(review_error)
     
     # Display results if review exists
     if st.session_state.current_review:
@@ -362,7 +647,7 @@ def main():
         st.markdown("---")
         render_download_section(review)
     
-    else:
+    elif st.session_state.pending_review is None:
         st.info("👈 Enter a paper ID and click 'Review Paper' to get started!")
 
 